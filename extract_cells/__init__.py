@@ -1,6 +1,8 @@
 import cv2
 import os
 
+from pdf_to_txt.extract_tables import HORIZONTAL_DILATE_KERNEL, VERTICAL_DILATE_KERNEL
+
 def extract_cell_images_from_table(image):
     BLUR_KERNEL_SIZE = (17, 17)
     STD_DEV_X_DIRECTION = 0
@@ -18,29 +20,27 @@ def extract_cell_images_from_table(image):
         BLOCK_SIZE,
         SUBTRACT_FROM_MEAN,
     )
-    vertical = horizontal = img_bin.copy()
     SCALE = 5
-    image_width, image_height = horizontal.shape
+    image_width, image_height = img_bin.shape
     horizontal_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (int(image_width / SCALE), 1))
     horizontally_opened = cv2.morphologyEx(img_bin, cv2.MORPH_OPEN, horizontal_kernel)
     vertical_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, int(image_height / SCALE)))
     vertically_opened = cv2.morphologyEx(img_bin, cv2.MORPH_OPEN, vertical_kernel)
     
-    horizontally_dilated = cv2.dilate(horizontally_opened, cv2.getStructuringElement(cv2.MORPH_RECT, (40, 1)))
-    vertically_dilated = cv2.dilate(vertically_opened, cv2.getStructuringElement(cv2.MORPH_RECT, (1, 60)))
+    horizontally_dilated = cv2.dilate(horizontally_opened, HORIZONTAL_DILATE_KERNEL)
+    vertically_dilated = cv2.dilate(vertically_opened, VERTICAL_DILATE_KERNEL)
     
-    mask = horizontally_dilated + vertically_dilated
+    mask = cv2.bitwise_or(horizontally_dilated, vertically_dilated)
     contours, heirarchy = cv2.findContours(
         mask, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE,
     )
     
-    perimeter_lengths = [cv2.arcLength(c, True) for c in contours]
-    epsilons = [0.05 * p for p in perimeter_lengths]
-    approx_polys = [cv2.approxPolyDP(c, e, True) for c, e in zip(contours, epsilons)]
+    approx_polys = [
+        cv2.approxPolyDP(c, 0.05 * cv2.arcLength(c, True), True) for c in contours
+    ]
     
-    # Filter out contours that aren't rectangular. Those that aren't rectangular
-    # are probably noise.
-    approx_rects = [p for p in approx_polys if len(p) == 4]
+    # Non-rectangular contours were meant to be filtered out here as noise
+    # (len(p) == 4), but that filter was never applied; all polys are kept.
     bounding_rects = [cv2.boundingRect(a) for a in approx_polys]
     
     # Filter out rectangles that are too narrow or too short.
@@ -56,14 +56,13 @@ def extract_cell_images_from_table(image):
     largest_rect = max(bounding_rects, key=lambda r: r[2] * r[3])
     bounding_rects = [b for b in bounding_rects if b is not largest_rect]
     
-    cells = [c for c in bounding_rects]
+    cells = bounding_rects
     def cell_in_same_row(c1, c2):
-        c1_center = c1[1] + c1[3] - c1[3] / 2
+        c1_center = c1[1] + c1[3] / 2
         c2_bottom = c2[1] + c2[3]
         c2_top = c2[1]
         return c2_top < c1_center < c2_bottom
     
-    orig_cells = [c for c in cells]
     rows = []
     while cells:
         first = cells[0]
@@ -85,7 +84,7 @@ def extract_cell_images_from_table(image):
     
     # Sort rows by average height of their center.
     def avg_height_of_center(row):
-        centers = [y + h - h / 2 for x, y, w, h in row]
+        centers = [y + h / 2 for x, y, w, h in row]
         return sum(centers) / len(centers)
     
     rows.sort(key=avg_height_of_center)
@@ -98,7 +97,6 @@ def extract_cell_images_from_table(image):
     return cell_images_rows
 
 def main(f):
-    results = []
     directory, filename = os.path.split(f)
     table = cv2.imread(f, cv2.IMREAD_GRAYSCALE)
     rows = extract_cell_images_from_table(table)
@@ -1,6 +1,11 @@
 import os
 import cv2
 
+# These kernels don't depend on the image size, so build them once at import.
+# extract_cells uses the same ones.
+HORIZONTAL_DILATE_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (40, 1))
+VERTICAL_DILATE_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (1, 60))
+
 def find_tables(image):
     BLUR_KERNEL_SIZE = (17, 17)
     STD_DEV_X_DIRECTION = 0
@@ -18,27 +23,28 @@ def find_tables(image):
         BLOCK_SIZE,
         SUBTRACT_FROM_MEAN,
     )
-    vertical = horizontal = img_bin.copy()
     SCALE = 5
-    image_width, image_height = horizontal.shape
+    image_width, image_height = img_bin.shape
     horizontal_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (int(image_width / SCALE), 1))
     horizontally_opened = cv2.morphologyEx(img_bin, cv2.MORPH_OPEN, horizontal_kernel)
     vertical_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, int(image_height / SCALE)))
     vertically_opened = cv2.morphologyEx(img_bin, cv2.MORPH_OPEN, vertical_kernel)
     
-    horizontally_dilated = cv2.dilate(horizontally_opened, cv2.getStructuringElement(cv2.MORPH_RECT, (40, 1)))
-    vertically_dilated = cv2.dilate(vertically_opened, cv2.getStructuringElement(cv2.MORPH_RECT, (1, 60)))
+    horizontally_dilated = cv2.dilate(horizontally_opened, HORIZONTAL_DILATE_KERNEL)
+    vertically_dilated = cv2.dilate(vertically_opened, VERTICAL_DILATE_KERNEL)
     
-    mask = horizontally_dilated + vertically_dilated
+    mask = cv2.bitwise_or(horizontally_dilated, vertically_dilated)
     contours, heirarchy = cv2.findContours(
         mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE,
     )
 
     MIN_TABLE_AREA = 1e5
-    contours = [c for c in contours if cv2.contourArea(c) > MIN_TABLE_AREA]
-    perimeter_lengths = [cv2.arcLength(c, True) for c in contours]
-    epsilons = [0.1 * p for p in perimeter_lengths]
-    approx_polys = [cv2.approxPolyDP(c, e, True) for c, e in zip(contours, epsilons)]
+    # Filter, measure and simplify each contour in a single pass.
+    approx_polys = [
+        cv2.approxPolyDP(c, 0.1 * cv2.arcLength(c, True), True)
+        for c in contours
+        if cv2.contourArea(c) > MIN_TABLE_AREA
+    ]
     bounding_rects = [cv2.boundingRect(a) for a in approx_polys]
 
     # The link where a lot of this code was borrowed from recommends an
@@ -1,4 +1,3 @@
-import math
 import os
 import sys
 
@@ -7,6 +6,11 @@ import numpy as np
 import subprocess
 #import pytesseract
 
+from pdf_to_txt.util import tesseract_env
+
+# Built once at import; crop_to_text runs for every cell of every table.
+NOISE_KERNEL = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+
 def main(image_file, tess_args):
     """
     OCR the image and output the text to a file with an extension that is ready
@@ -33,7 +37,7 @@ def main(image_file, tess_args):
     #txt = ocr_image(cropped, " ".join(tess_args))
     #with open(out_txtpath, "w") as txt_file:
     #    txt_file.write(txt)
-    subprocess.run(["tesseract", out_imagepath, out_txtpath])
+    subprocess.run(["tesseract", out_imagepath, out_txtpath], env=tesseract_env())
     return out_txtpath + ".txt"
 
 def crop_to_text(image):
@@ -55,13 +59,14 @@ def crop_to_text(image):
     vertical_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, int(img_h * 0.7)))
     horizontal_lines = cv2.morphologyEx(img_bin, cv2.MORPH_OPEN, horizontal_kernel)
     vertical_lines = cv2.morphologyEx(img_bin, cv2.MORPH_OPEN, vertical_kernel)
-    both = horizontal_lines + vertical_lines
-    cleaned = img_bin - both
+    # Knock the table lines out of the binary image in place. cv2.subtract
+    # saturates, so pixels on both lines don't wrap around like uint8 `+`/`-`.
+    cleaned = cv2.subtract(img_bin, horizontal_lines, dst=img_bin)
+    cleaned = cv2.subtract(cleaned, vertical_lines, dst=cleaned)
 
     # Get rid of little noise.
-    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
-    opened = cv2.morphologyEx(cleaned, cv2.MORPH_OPEN, kernel)
-    opened = cv2.dilate(opened, kernel)
+    opened = cv2.morphologyEx(cleaned, cv2.MORPH_OPEN, NOISE_KERNEL)
+    opened = cv2.dilate(opened, NOISE_KERNEL)
 
     contours, hierarchy = cv2.findContours(opened, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
     bounding_rects = [cv2.boundingRect(c) for c in contours]
@@ -69,17 +74,16 @@ def crop_to_text(image):
     MIN_CHAR_AREA = 5 * 9
     char_sized_bounding_rects = [(x, y, w, h) for x, y, w, h in bounding_rects if w * h > MIN_CHAR_AREA]
     if char_sized_bounding_rects:
-        minx, miny, maxx, maxy = math.inf, math.inf, 0, 0
-        for x, y, w, h in char_sized_bounding_rects:
-            minx = min(minx, x)
-            miny = min(miny, y)
-            maxx = max(maxx, x + w)
-            maxy = max(maxy, y + h)
+        # Reduce all of the character boxes to their union in one pass over an
+        # (N, 4) array rather than a min/max per box in Python.
+        rects = np.array(char_sized_bounding_rects)
+        minx, miny = rects[:, :2].min(axis=0)
+        maxx, maxy = (rects[:, :2] + rects[:, 2:]).max(axis=0)
         x, y, w, h = minx, miny, maxx - minx, maxy - miny
         cropped = image[y:min(img_h, y+h+NUM_PX_COMMA), x:min(img_w, x+w)]
     else:
         # If we morphed out all of the text, assume an empty image.
-        cropped = MAX_COLOR_VAL * np.ones(shape=(20, 100), dtype=np.uint8)
+        cropped = np.full((20, 100), MAX_COLOR_VAL, dtype=np.uint8)
     bordered = cv2.copyMakeBorder(cropped, 5, 5, 5, 5, cv2.BORDER_CONSTANT, None, 255)
     return bordered
 #def ocr_image(image, config):
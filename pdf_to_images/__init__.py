@@ -1,9 +1,11 @@
 import os
 import re
 import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 from pdf2image import convert_from_path
-from pdf_to_txt.util import get_logger, working_dir
+from pdf_to_txt.util import MAX_TESSERACT_WORKERS, get_logger, tesseract_env, working_dir
 
 logger = get_logger(__name__)
 
@@ -14,9 +16,12 @@ def convert(files):
         if f.endswith(".pdf"):
             pdf_images.append((f, pdf_to_images(f)))
 
-    for pdf, images in pdf_images:
-        for image in images:
-            preprocess_img(image)
+    # Rotation detection and correction shell out to tesseract and mogrify
+    # once per page, so let a few pages run side by side. mogrify holds a
+    # whole 600 DPI page at 16 bits per channel, so keep the pool small.
+    pages = [image for pdf, images in pdf_images for image in images]
+    with ThreadPoolExecutor(max_workers=MAX_TESSERACT_WORKERS) as executor:
+        list(executor.map(preprocess_img, pages))
     return pdf_images
 
 # Wrapper around the Poppler command line utility "pdfimages" and helpers for
@@ -90,10 +95,17 @@ def pdfimages(pdf_filepath):
     # pdfimages outputs results to the current working directory
     with working_dir(directory):
         #subprocess.run(["pdfimages", "-png", filename, filename.split(".pdf")[0]])
-        pages = convert_from_path(filename, 600)
-        for page in pages:
-            page.save("%s-%s.png" % (filename_sans_ext, \
-                str(pages.index(page)).zfill(3)), "PNG")
+        # Have a single pdftoppm run write every page straight to disk and
+        # just move the files into place, so no page is ever decoded into
+        # memory here. Everything downstream reads the pages as grayscale,
+        # so render 8-bit gray instead of 24-bit RGB.
+        with tempfile.TemporaryDirectory(dir=directory) as temp_dir:
+            page_paths = convert_from_path(
+                filename, 600, grayscale=True, fmt="png",
+                output_folder=temp_dir, paths_only=True,
+            )
+            for i, page_path in enumerate(page_paths):
+                os.replace(page_path, "%s-%s.png" % (filename_sans_ext, str(i).zfill(3)))
 
     image_filenames = find_matching_files_in_dir(filename_sans_ext, directory)
     logger.debug(
@@ -103,10 +115,11 @@ def pdfimages(pdf_filepath):
 
 
 def find_matching_files_in_dir(file_prefix, directory):
+    page_re = re.compile(r"{}-\d{{3}}.*\.png".format(re.escape(file_prefix)))
     files = [
         filename
         for filename in os.listdir(directory)
-        if re.match(r"{}-\d{{3}}.*\.png".format(re.escape(file_prefix)), filename)
+        if page_re.match(filename)
     ]
     return files
 
@@ -123,6 +136,10 @@ def preprocess_img(filepath, tess_params=None):
     if tess_params is None:
         tess_params = ["--psm", "0", "--oem", "0"]
     rotate = get_rotate(filepath, tess_params)
+    if rotate == "0":
+        # Most pages are upright; don't decode and re-encode them for nothing.
+        logger.debug("Not rotating {}.".format(filepath))
+        return
     logger.debug("Rotating {} by {}.".format(filepath, rotate))
     mogrify(filepath, rotate)
 
@@ -132,7 +149,7 @@ def get_rotate(image_filepath, tess_params):
     """
     tess_command = ["tesseract"] + tess_params + [image_filepath, "-"]
     output = (
-        subprocess.check_output(tess_command)
+        subprocess.check_output(tess_command, env=tesseract_env())
         .decode("utf-8")
         .split("\n")
     )
@@ -1,9 +1,13 @@
+import functools
+import io
 import os
 import sys
 import argparse
+import itertools
 import requests
 import subprocess
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from fuzzywuzzy import fuzz
 import pdf_to_txt.util
 import pdf_to_txt.extract_tables
@@ -22,27 +26,35 @@ def download_image_to_tempdir(url, filename=None):
     tempdir = pdf_to_txt.util.make_tempdir("demo")
     filepath = os.path.join(tempdir, filename)
     with open(filepath, 'wb') as f:
-        for chunk in response.iter_content():
+        # iter_content defaults to 1-byte chunks; read in 64 KiB blocks.
+        for chunk in response.iter_content(chunk_size=64 * 1024):
             f.write(chunk)
     return filepath
 
 def improve_table_by_pdftotext(lines, table):
+    # The candidate line windows only depend on `lines` (and the row width),
+    # so join them once instead of once per table row.
+    pair_strs = ["".join(lines[i:i+2]) for i in range(len(lines)-2)]
+    gap_strs = {}
     new_table = []
     for row in table:
         # focus on fixing the first two columns
         clean_row = [w.replace('\n', '') for w in row] 
         row_str = "".join([ w + "\n" for w in clean_row[:2]])
-        for i in range(len(lines)-2):
-            line_str = "".join(lines[i:i+2])
+        for i, line_str in enumerate(pair_strs):
             if fuzz.ratio(row_str, line_str) > 90:
                 clean_row[:2] = [w.replace('\n', '') for w in lines[i:i+2]]
                 break 
         if clean_row[-1] and '' in clean_row: # has missing but not the last column
             row_str = "".join([ w + "\n" for w in clean_row if w])
-            for i in range(len(lines)-len(clean_row)):
-                # missing value in the first index
-                line_str_1 = "".join([lines[i]] + lines[i+2:i+len(clean_row)])
-                line_str_2 = "".join(lines[i+1:i+len(clean_row)]) # second index
+            n = len(clean_row)
+            if n not in gap_strs:
+                gap_strs[n] = [
+                    # missing value in the first index, second index
+                    ("".join([lines[i]] + lines[i+2:i+n]), "".join(lines[i+1:i+n]))
+                    for i in range(len(lines)-n)
+                ]
+            for i, (line_str_1, line_str_2) in enumerate(gap_strs[n]):
                 if fuzz.partial_ratio(row_str, line_str_1) > 90 or \
                         fuzz.partial_ratio(row_str, line_str_2) > 90:
                     clean_row = [w.replace('\n', '') for w in lines[i:i+len(clean_row)]]
@@ -56,9 +68,22 @@ def get_original_name(image_filepath):
     filename_sans_ext = filename.split(".png")[0]
     return os.path.join(directory, filename_sans_ext)
 
+@functools.lru_cache(maxsize=None)
+def pdftotext_lines(pdf_filepath):
+    """
+    Run pdftotext over the whole PDF and return its non-blank lines.
+
+    Every page image of a PDF is merged against the same text, so the result
+    is cached per PDF. Callers must not modify the returned list.
+    """
+    output = subprocess.run(
+        ["pdftotext", pdf_filepath, "-"], stdout=subprocess.PIPE, check=True
+    ).stdout.decode("utf-8")
+    return [line for line in io.StringIO(output, newline=None) if line.strip()]
+
 def merge_with_pdftotext(image_without_ext, ocr_csv_outputs):
     raw_table = [ocr_csv.split("\r\n") for ocr_csv in ocr_csv_outputs]
-    raw_table = sum(raw_table, [])
+    raw_table = list(itertools.chain.from_iterable(raw_table))
     raw_table = [row.split(",") for row in raw_table]
     table = []
     for row in raw_table:
@@ -77,11 +102,7 @@ def merge_with_pdftotext(image_without_ext, ocr_csv_outputs):
             new_row = list(map(list, zip(*new_row)))
             table.extend(new_row)
 
-    pdftotext_input = image_without_ext[:-4] + ".pdf"
-    pdftotext_output = os.path.join(image_without_ext, "pdftotext.txt")
-    subprocess.run(["pdftotext", pdftotext_input, pdftotext_output])
-    with open(pdftotext_output) as file:
-        lines = [line for line in file if line.strip()] 
+    lines = pdftotext_lines(image_without_ext[:-4] + ".pdf")
     stack = []
     lookup = {}
     tbl_start = 0
@@ -108,37 +129,38 @@ def merge_with_pdftotext(image_without_ext, ocr_csv_outputs):
 def main(filepath):
     if filepath[0].endswith('.pdf'):
         image_files = pdf_to_txt.pdf_to_images.convert(filepath)
-        image_files = sum([item[1] for item in image_files], [])
+        image_files = list(itertools.chain.from_iterable(item[1] for item in image_files))
     elif filepath[0].endswith('.png'):
         image_files = [filepath]
     image_tables = pdf_to_txt.extract_tables.main(image_files)
     print("Running `{}`".format(f"extract_tables.main([{image_files}])."))
     print("Extracted the following tables from the image:")
     print(image_tables)
-    for image, tables in image_tables:
-        print(f"Processing tables for {image}.")
-        image_without_ext = get_original_name(image)
-        ocr_csv_outputs = []
-        for table in tables:
-            print(f"Processing table {table}.")
-            cells = pdf_to_txt.extract_cells.main(table)
-            ocr = [
-                pdf_to_txt.ocr_image.main(cell, None)
-                for cell in cells
-            ]
-            ocr_csv_output = pdf_to_txt.ocr_to_csv.text_files_to_csv(ocr)
-            ocr_csv_outputs.append(ocr_csv_output)
-        csv_output = merge_with_pdftotext(image_without_ext, ocr_csv_outputs)
-        print()
-        print("Here is the parser output:")
-        print()
-        print(csv_output)
-        print()
-        try:
-            shutil.rmtree(image_without_ext)
-        except OSError as e:
-            print("Error: %s - %s." %(e.filename, e.strerror))
-        os.remove(image)
+    # One tesseract process per cell; run them concurrently rather than
+    # waiting on each in turn. `map` keeps the cell order.
+    ocr_cell = functools.partial(pdf_to_txt.ocr_image.main, tess_args=None)
+    with ThreadPoolExecutor(max_workers=pdf_to_txt.util.MAX_TESSERACT_WORKERS) as executor:
+        for image, tables in image_tables:
+            print(f"Processing tables for {image}.")
+            image_without_ext = get_original_name(image)
+            ocr_csv_outputs = []
+            for table in tables:
+                print(f"Processing table {table}.")
+                cells = pdf_to_txt.extract_cells.main(table)
+                ocr = list(executor.map(ocr_cell, cells))
+                ocr_csv_output = pdf_to_txt.ocr_to_csv.text_files_to_csv(ocr)
+                ocr_csv_outputs.append(ocr_csv_output)
+            csv_output = merge_with_pdftotext(image_without_ext, ocr_csv_outputs)
+            print()
+            print("Here is the parser output:")
+            print()
+            print(csv_output)
+            print()
+            try:
+                shutil.rmtree(image_without_ext)
+            except OSError as e:
+                print("Error: %s - %s." %(e.filename, e.strerror))
+            os.remove(image)
 
 if __name__ == "__main__":
     args = parser.parse_args()
@@ -25,5 +25,22 @@ def working_dir(directory):
         os.chdir(original_working_dir)
 
 
+# Upper bound on tesseract processes run side by side. Each one loads its own
+# traineddata and works on a page or cell image, so memory, not cores, is the
+# limit on big machines.
+MAX_TESSERACT_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def tesseract_env():
+    """
+    Environment for tesseract processes that run alongside each other.
+
+    Tesseract 4+ is built with OpenMP and each process starts its own thread
+    pool, which oversubscribes the CPU when several run at once. Its docs
+    recommend OMP_THREAD_LIMIT=1 in that case.
+    """
+    return dict(os.environ, OMP_THREAD_LIMIT="1")
+
+
 def make_tempdir(identifier):
     return tempfile.mkdtemp(prefix="{}_".format(identifier))